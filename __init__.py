@@ -4,12 +4,13 @@ Gotty Python Client
 A generic Python client for interacting with gotty terminal interfaces.
 """
 
-from .gotty_client import GottyWebSocketClient, ServerResponse
+from .gotty_client import AsyncGottyWebSocketClient, GottyWebSocketClient, ServerResponse
 
 __version__ = "1.0.0"
 __author__ = "Thomas Wentworth"
 
 __all__ = [
+    'AsyncGottyWebSocketClient',
     'GottyWebSocketClient',
     'ServerResponse',
 ]
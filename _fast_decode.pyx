@@ -0,0 +1,137 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional C fast path for decoding gotty output messages.
+
+Build it with ``GOTTY_PY_BUILD_EXT=1 pip install .`` (requires Cython).
+When the extension is not available the client falls back to binascii.
+"""
+
+import binascii
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_FromStringAndSize, PyBytes_GET_SIZE
+from cpython.unicode cimport PyUnicode_DecodeUTF8
+from libc.stdlib cimport free, malloc
+from libc.string cimport memset
+
+
+cdef extern from "Python.h":
+    const char* PyUnicode_AsUTF8AndSize(object unicode, Py_ssize_t* size) except NULL
+
+
+# Maps each input byte to its 6-bit value, or 0xFF if it is not base64
+cdef unsigned char _B64_TABLE[256]
+
+
+cdef void _init_table():
+    cdef bytes alphabet = (
+        b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+    )
+    cdef int i
+    memset(_B64_TABLE, 0xFF, 256)
+    for i in range(64):
+        _B64_TABLE[<unsigned char>alphabet[i]] = i
+
+
+_init_table()
+
+
+cdef enum:
+    STACK_BUFFER_SIZE = 4096
+
+
+def decode_b64_utf8(payload):
+    """
+    Decode a base64 payload into its raw bytes and UTF-8 text.
+
+    Both results are built from one C buffer, so no intermediate bytes object
+    is decoded a second time. Malformed input is treated exactly as by
+    binascii.a2b_base64: characters outside the base64 alphabet are skipped,
+    decoding stops once padding completes a quantum, a truncated quantum
+    raises binascii.Error and a non-ASCII str raises ValueError. Invalid
+    UTF-8 sequences are dropped from the text.
+
+    Args:
+        payload: Base64 data as str or bytes
+
+    Returns:
+        Tuple of (raw bytes, decoded text)
+    """
+    cdef const char* src
+    cdef Py_ssize_t n
+    cdef Py_ssize_t i
+    cdef Py_ssize_t j = 0
+    cdef Py_ssize_t data_chars = 0
+    cdef unsigned char ch
+    cdef unsigned char c
+    cdef unsigned char leftchar = 0
+    cdef int quad_pos = 0
+    cdef int pads = 0
+    cdef bint padded = False
+    cdef char stack_buf[STACK_BUFFER_SIZE]
+    cdef char* dst = stack_buf
+
+    if isinstance(payload, bytes):
+        src = PyBytes_AS_STRING(payload)
+        n = PyBytes_GET_SIZE(payload)
+    else:
+        if not payload.isascii():
+            raise ValueError("string argument should contain only ASCII characters")
+        src = PyUnicode_AsUTF8AndSize(payload, &n)
+
+    if (n // 4) * 3 + 3 > STACK_BUFFER_SIZE:
+        dst = <char*>malloc((n // 4) * 3 + 3)
+        if dst == NULL:
+            raise MemoryError()
+
+    try:
+        for i in range(n):
+            ch = <unsigned char>src[i]
+            if ch == b'=':
+                # Padding only counts once two data characters are pending
+                if quad_pos >= 2:
+                    pads += 1
+                    if quad_pos + pads >= 4:
+                        padded = True
+                        break
+                continue
+
+            c = _B64_TABLE[ch]
+            if c == 0xFF:
+                continue
+            data_chars += 1
+            pads = 0
+
+            if quad_pos == 0:
+                leftchar = c
+                quad_pos = 1
+            elif quad_pos == 1:
+                dst[j] = <char>(((leftchar << 2) | (c >> 4)) & 0xFF)
+                j += 1
+                leftchar = c & 0x0F
+                quad_pos = 2
+            elif quad_pos == 2:
+                dst[j] = <char>(((leftchar << 4) | (c >> 2)) & 0xFF)
+                j += 1
+                leftchar = c & 0x03
+                quad_pos = 3
+            else:
+                dst[j] = <char>(((leftchar << 6) | c) & 0xFF)
+                j += 1
+                leftchar = 0
+                quad_pos = 0
+
+        if not padded and quad_pos == 1:
+            raise binascii.Error(
+                "Invalid base64-encoded string: number of data characters "
+                f"({data_chars}) cannot be 1 more than a multiple of 4"
+            )
+        if not padded and quad_pos != 0:
+            raise binascii.Error("Incorrect padding")
+
+        return (
+            PyBytes_FromStringAndSize(dst, j),
+            PyUnicode_DecodeUTF8(dst, j, "ignore"),
+        )
+    finally:
+        if dst != stack_buf:
+            free(dst)
@@ -8,6 +8,7 @@ This example demonstrates real-time callbacks and more advanced features.
 import os
 import sys
 import time
+from collections import deque
 
 # Add the parent directory to the path so we can import gotty_py
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -21,51 +22,55 @@ class AdvancedGottyClient:
     def __init__(self, webui_url, username, password):
         """Initialize the advanced client."""
         self.client = GottyWebSocketClient(webui_url, username, password)
-        self.output_buffer = []
+        self.output_buffer = deque(maxlen=100)  # Keep only last 100 lines
         self.command_count = 0
 
+        # Formatted timestamp, refreshed at most once per second
+        self._ts_cache_sec = 0
+        self._ts_cache_str = ""
+
         # Set up callbacks
         self.client.add_output_callback(self._on_output)
         self.client.add_command_callback(self._on_command)
 
+    def _timestamp(self):
+        """Get the current time as HH:MM:SS, formatting once per second."""
+        now = int(time.time())
+        if now != self._ts_cache_sec:
+            self._ts_cache_sec = now
+            self._ts_cache_str = time.strftime("%H:%M:%S", time.localtime(now))
+        return self._ts_cache_str
+
     def _on_output(self, data):
         """Callback for real-time output."""
-        timestamp = time.strftime("%H:%M:%S")
+        timestamp = self._timestamp()
         self.output_buffer.append(f"[{timestamp}] {data.strip()}")
 
-        # Keep only last 100 lines
-        if len(self.output_buffer) > 100:
-            self.output_buffer = self.output_buffer[-100:]
-
         # Print to console in real-time
         print(f"📤 {data.strip()}")
 
     def _on_command(self, command):
         """Callback for command completions."""
         self.command_count += 1
-        timestamp = time.strftime("%H:%M:%S")
+        timestamp = self._timestamp()
         print(f"🎯 [{timestamp}] Command #{self.command_count}: {command}")
 
     def connect(self):
         """Connect to the gotty server."""
         return self.client.connect()
 
-    def execute_commands(self, commands, delay=1.0):
-        """Execute multiple commands with delay."""
-        for i, command in enumerate(commands):
-            print(f"\n🚀 Executing command {i+1}/{len(commands)}: {command}")
+    def execute_commands(self, commands):
+        """Execute multiple commands sent together in a single frame."""
+        print(f"\n🚀 Executing {len(commands)} commands: {', '.join(commands)}")
 
-            response = self.client.execute_command(command, timeout=10.0)
+        responses = self.client.execute_commands_batch(commands, timeout=10.0)
 
+        for command, response in zip(commands, responses):
             if response.success:
                 print(f"✅ Command '{command}' succeeded")
             else:
                 print(f"❌ Command '{command}' failed: " f"{response.message}")
 
-            # Wait before next command
-            if i < len(commands) - 1:
-                time.sleep(delay)
-
     def get_stats(self):
         """Get client statistics."""
         return {
@@ -102,7 +107,7 @@ def main():
             commands = ["ls", "pwd", "whoami", "date"]
 
             print(f"\nExecuting {len(commands)} commands...")
-            client.execute_commands(commands, delay=0.5)
+            client.execute_commands(commands)
 
             # Show statistics
             print("\n" + "=" * 40)
@@ -116,7 +121,8 @@ def main():
             print("\n" + "=" * 40)
             print("📝 RECENT OUTPUT")
             print("=" * 40)
-            recent_output = client.output_buffer[-10:]  # Last 10 lines
+            # Copy before iterating: callbacks append from another thread
+            recent_output = list(client.output_buffer)[-10:]  # Last 10 lines
             for line in recent_output:
                 print(line)
 
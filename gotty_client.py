@@ -1,26 +1,94 @@
 """
 Generic Gotty WebSocket Client
 
-This module provides a WebSocket client for interacting with any gotty terminal interface.
+This module provides a WebSocket client for interacting with any gotty terminal interface,
+plus an asyncio-native variant for applications that already run an event loop.
 """
 
 import asyncio
 import json
-import time
 import logging
 import threading
+import time
 import base64
-from typing import Optional, List, Callable, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from binascii import a2b_base64
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Optional, List, Callable, Any, Tuple, Deque
 from dataclasses import dataclass
 from urllib.parse import urljoin, urlparse
 
-import requests
 import websockets
 from websockets.exceptions import WebSocketException
 
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+try:
+    from ._fast_decode import decode_b64_utf8
+except ImportError:
+    def decode_b64_utf8(payload) -> Tuple[bytes, str]:
+        """Decode a base64 payload into its raw bytes and UTF-8 text."""
+        raw = a2b_base64(payload)
+        return raw, raw.decode('utf-8', 'ignore')
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Shared session for the liveness probe so reconnects reuse pooled sockets.
+# requests is only imported on first connect, keeping `import gotty_py` cheap.
+_http_session: Optional["requests.Session"] = None
+
+
+def _get_http_session() -> "requests.Session":
+    """Return the shared HTTP probe session, creating it on first use."""
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        _http_session = session
+    return _http_session
+
+def _build_handshake(auth_token: str) -> str:
+    """
+    Build the gotty handshake message for an auth token.
+    
+    The result is kept as str: gotty rejects a handshake that does not arrive
+    as a text frame. json.dumps handles escaping of any token characters.
+    """
+    return json.dumps(
+        {"Arguments": "", "AuthToken": auth_token},
+        separators=(',', ':')
+    )
+
+def _build_ws_url(parsed_url) -> str:
+    """Build the gotty WebSocket endpoint, using wss:// for an https web UI."""
+    scheme = 'wss' if parsed_url.scheme == 'https' else 'ws'
+    return f"{scheme}://{parsed_url.netloc}/ws"
+
+def _append_line_data(line_buf: bytearray, raw: bytes, history: Deque[str]):
+    """Add raw output to the partial line buffer, moving complete lines to history."""
+    line_buf += raw
+    if b'\n' in raw:
+        *lines, tail = line_buf.split(b'\n')
+        for line in lines:
+            text = line.decode('utf-8', 'ignore').strip()
+            if text:
+                history.append(text)
+        line_buf[:] = tail
+
 @dataclass
 class ServerResponse:
     """Container for server response data."""
@@ -29,7 +97,164 @@ class ServerResponse:
     message: str
     status_code: int
 
-class GottyWebSocketClient:
+class _GottyClientBase:
+    """
+    State and helpers shared by the sync and asyncio gotty clients.
+    
+    Holds the connection settings, the precomputed URL/handshake/auth
+    values and the terminal output buffers. Subclasses whose buffers are
+    updated from another thread override _output_view() to guard reads.
+    """
+    
+    def __init__(
+        self,
+        webui_url: str,
+        username: str,
+        password: str,
+        timeout: int,
+        compression: Optional[str],
+        max_queue: Optional[int],
+        terminal_output_maxlen: Optional[int]
+    ):
+        self.webui_url = webui_url
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.compression = compression
+        self.max_queue = max_queue
+        
+        # WebSocket connection
+        self.websocket: Optional[websockets.WebSocketServerProtocol] = None
+        self.connected = False
+        
+        # Terminal state
+        # Bounded ring buffers: old entries are evicted in O(1) on append
+        self._terminal_output: Deque[str] = deque(maxlen=terminal_output_maxlen)
+        # Raw bytes of the unterminated line, decoded once it is complete
+        self._current_line_buf = bytearray()
+        self._command_history: Deque[str] = deque(maxlen=100)
+        # Total number of output chunks ever received (not capped by maxlen)
+        self._output_count = 0
+        
+        # Callbacks for real-time updates
+        self._output_callbacks: List[Callable[[str], None]] = []
+        
+        # Parse the webui URL
+        parsed_url = urlparse(self.webui_url)
+        self.base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        
+        # Construct WebSocket URL with gotty protocol
+        self.ws_url = _build_ws_url(parsed_url)
+        self.auth_token = f"{self.username}:{self.password}"
+        
+        # Precompute per-connection constants so (re)connects skip the
+        # JSON and base64 encoding
+        self._handshake_data = _build_handshake(self.auth_token)
+        self._auth_header = base64.b64encode(self.auth_token.encode()).decode('ascii')
+        self._ws_headers = {
+            'Authorization': f'Basic {self._auth_header}',
+            'User-Agent': 'GottyPythonClient/1.0'
+        }
+    
+    def _output_view(self):
+        """Context in which the output buffers are complete and safe to read."""
+        return nullcontext()
+    
+    @property
+    def terminal_output(self) -> Deque[str]:
+        """
+        Received output chunks.
+        
+        This is the live buffer; use get_terminal_output() for a copy that
+        is safe to iterate while output is arriving.
+        """
+        with self._output_view():
+            return self._terminal_output
+    
+    @terminal_output.setter
+    def terminal_output(self, value: Deque[str]):
+        with self._output_view():
+            self._terminal_output = value
+    
+    @property
+    def command_history(self) -> Deque[str]:
+        """Completed output lines."""
+        with self._output_view():
+            return self._command_history
+    
+    @command_history.setter
+    def command_history(self, value: Deque[str]):
+        with self._output_view():
+            self._command_history = value
+    
+    @property
+    def current_line(self) -> str:
+        """The partial (not yet newline-terminated) output line."""
+        with self._output_view():
+            return self._current_line_buf.decode('utf-8', 'ignore')
+    
+    def _get_auth_header(self) -> str:
+        """Get base64 encoded authentication header."""
+        return self._auth_header
+    
+    def _probe_web_ui(self) -> bool:
+        """Check that the web UI accepts our credentials (blocking)."""
+        # A HEAD on a pooled session avoids downloading the page and
+        # re-handshaking on reconnects
+        response = _get_http_session().head(
+            self.webui_url,
+            auth=(self.username, self.password),
+            timeout=5,
+            allow_redirects=False
+        )
+        if not 200 <= response.status_code < 400:
+            logger.error(f"Web UI not accessible: {response.status_code}")
+            return False
+        return True
+    
+    async def _open_websocket(self, **kwargs):
+        """Open the gotty WebSocket; kwargs are passed to websockets.connect."""
+        logger.info(f"Connecting to WebSocket: {self.ws_url}")
+        return await websockets.connect(
+            self.ws_url,
+            subprotocols=["webtty"],
+            additional_headers=self._ws_headers,
+            ping_interval=30,
+            ping_timeout=10,
+            close_timeout=10,
+            compression=self.compression,
+            max_queue=self.max_queue,
+            write_limit=2**20,
+            **kwargs
+        )
+    
+    def get_terminal_output(self, last_n_lines: Optional[int] = None) -> List[str]:
+        """
+        Get terminal output.
+        
+        Args:
+            last_n_lines: Number of lines to return (None for all)
+        
+        Returns:
+            List of terminal output lines
+        """
+        with self._output_view():
+            n = len(self._terminal_output)
+            start = 0 if last_n_lines is None else max(0, n - last_n_lines)
+            # Build the result list in one pass straight from the deque
+            return list(islice(self._terminal_output, start, n))
+    
+    def get_command_history(self) -> List[str]:
+        """Get command history."""
+        with self._output_view():
+            return list(self._command_history)
+    
+    def add_output_callback(self, callback: Callable[[str], None]):
+        """Add a callback for real-time output updates."""
+        self._output_callbacks.append(callback)
+
+
+class GottyWebSocketClient(_GottyClientBase):
     """
     Generic WebSocket client for communicating with gotty terminal interfaces.
     
@@ -41,12 +266,25 @@ class GottyWebSocketClient:
     - Output messages are base64 encoded
     """
     
+    # Queued commands that force an early flush when coalescing
+    MAX_COALESCED_COMMANDS = 64
+    # Queued output chunks that force an early flush of received output
+    MAX_OUTPUT_BATCH = 128
+    # Seconds without new output after which a command's reply is complete
+    OUTPUT_QUIET_PERIOD = 0.05
+    # Idle payloads kept undecoded when terminal_output is unbounded
+    MAX_DEFERRED_OUTPUT = 1000
+    
     def __init__(
         self, 
         webui_url: str,
         username: str,
         password: str,
-        timeout: int = 30
+        timeout: int = 30,
+        coalesce_delay: float = 0.0,
+        compression: Optional[str] = None,
+        max_queue: Optional[int] = None,
+        terminal_output_maxlen: Optional[int] = 1000
     ):
         """
         Initialize the gotty WebSocket client.
@@ -56,20 +294,28 @@ class GottyWebSocketClient:
             username: Web UI username
             password: Web UI password
             timeout: Connection timeout in seconds
+            coalesce_delay: Seconds to buffer outgoing commands so bursts
+                are sent as a single frame (0 sends each command immediately)
+            compression: WebSocket compression ('deflate' or None); terminal
+                frames are usually too small to benefit, so it is off by default
+            max_queue: Maximum number of unread incoming frames buffered by
+                websockets (None for unbounded)
+            terminal_output_maxlen: Number of output chunks kept in
+                terminal_output before the oldest are evicted (None for
+                unbounded)
         """
-        self.webui_url = webui_url
-        self.username = username
-        self.password = password
-        self.timeout = timeout
+        super().__init__(
+            webui_url, username, password, timeout,
+            compression, max_queue, terminal_output_maxlen
+        )
+        self.coalesce_delay = coalesce_delay
         
-        # WebSocket connection
-        self.websocket: Optional[websockets.WebSocketServerProtocol] = None
-        self.connected = False
-        
-        # Terminal state
-        self.terminal_output: List[str] = []
-        self.current_line = ""
-        self.command_history: List[str] = []
+        # Raw output chunks received but not yet applied (event loop thread only)
+        self._pending_output: List[Tuple[bytes, str]] = []
+        # Base64 payloads received while nobody was watching; decoded on read
+        self._deferred_output: List[Any] = []
+        # Number of execute_command calls currently waiting for output
+        self._pending_waiters = 0
         
         # Threading for background operations
         self._listener_thread: Optional[threading.Thread] = None
@@ -77,39 +323,53 @@ class GottyWebSocketClient:
         self._lock = threading.Lock()
         self._event_loop: Optional[asyncio.AbstractEventLoop] = None
         
+        # Signalled when new output arrives (shares _lock)
+        self._output_cond = threading.Condition(self._lock)
+        # Set once the WebSocket is connected and the handshake is sent
+        self._connected_event = threading.Event()
+        
+        # Outgoing command coalescing (only used when coalesce_delay > 0)
+        self._send_buffer: List[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        
         # Callbacks for real-time updates
-        self._output_callbacks: List[Callable[[str], None]] = []
         self._command_callbacks: List[Callable[[str], None]] = []
+        # Immutable copy read by the message handler; rebuilt on registration
+        self._output_callbacks_snapshot: Tuple[Callable[[str], None], ...] = ()
+        # Single worker so callbacks run in order without stalling the loop
+        self._callback_executor: Optional[ThreadPoolExecutor] = None
         
-        # Parse the webui URL
-        parsed_url = urlparse(self.webui_url)
-        self.base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-        
-        # Construct WebSocket URL with gotty protocol
-        auth_token = f"{self.username}:{self.password}"
-        self.ws_url = f"ws://{parsed_url.netloc}/ws"
-        self.auth_token = auth_token
+        # Message type dispatch table for _handle_message
+        handlers = {
+            '1': self._on_output,
+            '2': self._on_pong,
+            '3': self._on_window_title,
+            '4': self._on_preferences,
+            '5': self._on_reconnect,
+        }
+        self._msg_handlers = dict(handlers)
+        self._msg_handlers.update({ord(k): v for k, v in handlers.items()})
         
+    @contextmanager
+    def _output_view(self):
+        """Hold the lock with output deferred while idle applied."""
+        with self._lock:
+            self._apply_deferred_output()
+            yield
+    
     def connect(self) -> bool:
         """Connect to the gotty WebSocket interface."""
         try:
             # Test HTTP connection first with authentication
-            response = requests.get(
-                self.webui_url, 
-                auth=(self.username, self.password),
-                timeout=5
-            )
-            if response.status_code != 200:
-                logger.error(f"Web UI not accessible: {response.status_code}")
+            if not self._probe_web_ui():
                 return False
             
             # Start the background listener thread
+            self._connected_event.clear()
             self._start_listener()
             
             # Wait for connection to be established
-            start_time = time.time()
-            while not self.connected and time.time() - start_time < 10:
-                time.sleep(0.1)
+            self._connected_event.wait(timeout=10)
             
             return self.connected
             
@@ -129,8 +389,8 @@ class GottyWebSocketClient:
     def _run_listener(self):
         """Run the WebSocket listener in a background thread."""
         try:
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
+            # Create new event loop for this thread (uvloop if installed)
+            loop = _new_event_loop()
             asyncio.set_event_loop(loop)
             self._event_loop = loop
             
@@ -142,53 +402,45 @@ class GottyWebSocketClient:
         finally:
             self._running = False
     
+    async def _connect_async(self):
+        """Open the WebSocket, send the handshake and signal connect()."""
+        self.websocket = await self._open_websocket()
+        
+        self.connected = True
+        logger.info("WebSocket connected successfully")
+        
+        # Send initial handshake
+        await self._send_handshake()
+        self._connected_event.set()
+    
     async def _listen_websocket(self):
         """Listen for WebSocket messages."""
         try:
-            logger.info(f"Connecting to WebSocket: {self.ws_url}")
-            
-            # Connect with gotty protocol
-            self.websocket = await websockets.connect(
-                self.ws_url,
-                subprotocols=["webtty"],
-                additional_headers={
-                    'Authorization': f'Basic {self._get_auth_header()}',
-                    'User-Agent': 'GottyPythonClient/1.0'
-                },
-                ping_interval=30,
-                ping_timeout=10,
-                close_timeout=10
-            )
-            
-            self.connected = True
-            logger.info("WebSocket connected successfully")
-            
-            # Send initial handshake
-            await self._send_handshake()
+            await self._connect_async()
             
             # Listen for messages
             logger.debug("Starting to listen for WebSocket messages...")
             async for message in self.websocket:
-                logger.debug(f"Raw message received: {repr(message)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Raw message received: {repr(message)}")
                 await self._handle_message(message)
                 
         except Exception as e:
             logger.error(f"WebSocket error: {e}")
         finally:
             self.connected = False
+            # Wake connect() straight away if the connection attempt failed
+            self._connected_event.set()
+            self._flush_output()
             if self.websocket:
                 await self.websocket.close()
             logger.info("WebSocket connection closed")
     
     async def _send_handshake(self):
         """Send the initial handshake message."""
-        handshake = {
-            "Arguments": "",
-            "AuthToken": self.auth_token
-        }
-        handshake_data = json.dumps(handshake)
-        logger.debug(f"Sending handshake: {handshake_data}")
-        await self.websocket.send(handshake_data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sending handshake: {self._handshake_data}")
+        await self.websocket.send(self._handshake_data)
     
     async def _handle_message(self, message):
         """Handle incoming WebSocket messages."""
@@ -196,73 +448,139 @@ class GottyWebSocketClient:
             if not message:
                 return
             
-            # Parse message type
+            # Dispatch on the type prefix; the table is keyed by both the
+            # character (text frames) and its code point (binary frames)
             msg_type = message[0]
-            payload = message[1:] if len(message) > 1 else ""
+            payload = message[1:]
             
-            logger.debug(f"Message type: {msg_type}, payload: {repr(payload)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Message type: {msg_type}, payload: {repr(payload)}")
             
-            if msg_type == '1':  # Output message
-                # Decode base64 payload
-                try:
-                    decoded_data = base64.b64decode(payload).decode('utf-8', errors='ignore')
-                    logger.debug(f"Decoded output: {repr(decoded_data)}")
-                    
-                    # Process the terminal output
-                    with self._lock:
-                        self.terminal_output.append(decoded_data)
-                        
-                        # Keep only last 1000 lines to prevent memory issues
-                        if len(self.terminal_output) > 1000:
-                            self.terminal_output = self.terminal_output[-1000:]
-                        
-                        # Update current line
-                        if decoded_data.endswith('\n'):
-                            # Complete line
-                            self.current_line += decoded_data.rstrip('\n')
-                            if self.current_line.strip():
-                                self.command_history.append(self.current_line.strip())
-                                # Keep only last 100 commands
-                                if len(self.command_history) > 100:
-                                    self.command_history = self.command_history[-100:]
-                            self.current_line = ""
-                        else:
-                            # Partial line
-                            self.current_line += decoded_data
-                    
-                    # Notify callbacks
-                    for callback in self._output_callbacks:
-                        try:
-                            callback(decoded_data)
-                        except Exception as e:
-                            logger.error(f"Callback error: {e}")
-                            
-                except Exception as e:
-                    logger.error(f"Failed to decode output message: {e}")
-                    
-            elif msg_type == '2':  # Pong message
-                logger.debug("Received pong")
-                
-            elif msg_type == '3':  # Set window title
-                logger.debug(f"Window title: {payload}")
-                
-            elif msg_type == '4':  # Set preferences
-                logger.debug(f"Preferences: {payload}")
-                
-            elif msg_type == '5':  # Set reconnect
-                logger.debug(f"Reconnect: {payload}")
-                
-            else:
+            handler = self._msg_handlers.get(msg_type)
+            if handler:
+                handler(payload)
+            elif logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Unknown message type: {msg_type}")
                     
         except Exception as e:
             logger.error(f"Error handling message: {e}")
     
-    def _get_auth_header(self) -> str:
-        """Get base64 encoded authentication header."""
-        import base64
-        auth_string = f"{self.username}:{self.password}"
-        return base64.b64encode(auth_string.encode()).decode()
+    def _on_output(self, payload):
+        """Handle an output message ('1')."""
+        if not payload:
+            return
+        
+        # With no callbacks or waiters nobody sees output as it
+        # arrives, so defer decoding until it is actually read
+        if (not self._output_callbacks_snapshot
+                and not self._pending_waiters
+                and not self._pending_output):
+            with self._lock:
+                if not self._pending_waiters:
+                    self._deferred_output.append(payload)
+                    limit = self._terminal_output.maxlen or self.MAX_DEFERRED_OUTPUT
+                    if len(self._deferred_output) >= limit:
+                        self._apply_deferred_output()
+                    return
+        
+        # Decode base64 payload (str and bytes are accepted alike)
+        try:
+            chunk = decode_b64_utf8(payload)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Decoded output: {repr(chunk[1])}")
+        except Exception as e:
+            logger.error(f"Failed to decode output message: {e}")
+            return
+        
+        # Queue the chunk; frames already buffered by websockets are
+        # drained without yielding, so the flush scheduled here runs
+        # once per burst when the receive loop next waits for data
+        self._pending_output.append(chunk)
+        if len(self._pending_output) >= self.MAX_OUTPUT_BATCH:
+            self._flush_output()
+        elif len(self._pending_output) == 1:
+            asyncio.get_running_loop().call_soon(self._flush_output)
+    
+    def _on_pong(self, payload):
+        """Handle a pong message ('2')."""
+        logger.debug("Received pong")
+    
+    def _on_window_title(self, payload):
+        """Handle a set window title message ('3')."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Window title: {payload}")
+    
+    def _on_preferences(self, payload):
+        """Handle a set preferences message ('4')."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Preferences: {payload}")
+    
+    def _on_reconnect(self, payload):
+        """Handle a set reconnect message ('5')."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Reconnect: {payload}")
+    
+    def _flush_output(self):
+        """Process all queued output chunks as a single batch."""
+        if not self._pending_output:
+            return
+        chunks, self._pending_output = self._pending_output, []
+        
+        with self._lock:
+            self._apply_deferred_output()
+            batch = self._apply_output(chunks)
+            self._output_cond.notify_all()
+        
+        # Notify callbacks off the event loop thread
+        callbacks = self._output_callbacks_snapshot
+        if callbacks:
+            self._get_callback_executor().submit(
+                self._run_callbacks, callbacks, ''.join(batch)
+            )
+    
+    def _apply_output(self, chunks: List[Tuple[bytes, str]]) -> List[str]:
+        """Add decoded chunks to the terminal state (caller holds _lock)."""
+        batch = [text for _, text in chunks]
+        self._terminal_output.extend(batch)
+        self._output_count += len(batch)
+        
+        # Update current line; completed lines go to the history
+        for raw, _ in chunks:
+            _append_line_data(self._current_line_buf, raw, self._command_history)
+        
+        return batch
+    
+    def _apply_deferred_output(self):
+        """Decode output deferred while idle (caller holds _lock)."""
+        if not self._deferred_output:
+            return
+        deferred, self._deferred_output = self._deferred_output, []
+        
+        chunks = []
+        for payload in deferred:
+            try:
+                chunks.append(decode_b64_utf8(payload))
+            except Exception as e:
+                logger.error(f"Failed to decode output message: {e}")
+        self._apply_output(chunks)
+    
+    def _get_callback_executor(self) -> ThreadPoolExecutor:
+        """Get the callback worker, creating it on first use."""
+        if self._callback_executor is None:
+            self._callback_executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="gotty-callbacks"
+            )
+        return self._callback_executor
+    
+    @staticmethod
+    def _run_callbacks(callbacks: Tuple[Callable[[str], None], ...], data: str):
+        """Invoke each callback with data, logging any failures."""
+        for callback in callbacks:
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error(f"Callback error: {e}")
     
     def send_command(self, command: str) -> bool:
         """
@@ -278,19 +596,24 @@ class GottyWebSocketClient:
             logger.error("Not connected to WebSocket")
             return False
         
+        if self.coalesce_delay > 0:
+            return self._queue_command(command)
+        
         try:
             # Format command according to gotty protocol
             # Input messages are prefixed with '1'
             # Add newline to execute the command
             command_data = '1' + command + '\n'
-            logger.debug(f"Sending command '{command}' as: {repr(command_data)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Sending command '{command}' as: {repr(command_data)}")
             
             if self._event_loop:
                 asyncio.run_coroutine_threadsafe(
                     self.websocket.send(command_data),
                     self._event_loop
                 )
-                logger.debug(f"Command '{command}' sent successfully")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Command '{command}' sent successfully")
                 return True
             else:
                 logger.error("Event loop not initialized for sending command.")
@@ -300,10 +623,87 @@ class GottyWebSocketClient:
             logger.error(f"Failed to send command: {e}")
             return False
     
+    def _queue_command(self, command: str) -> bool:
+        """Append a command to the send buffer and schedule a flush."""
+        if not self._event_loop:
+            logger.error("Event loop not initialized for sending command.")
+            return False
+        
+        try:
+            with self._lock:
+                self._send_buffer.append(command + '\n')
+                flush_now = len(self._send_buffer) >= self.MAX_COALESCED_COMMANDS
+            
+            if flush_now:
+                asyncio.run_coroutine_threadsafe(
+                    self._flush_send_buffer(),
+                    self._event_loop
+                )
+            else:
+                self._event_loop.call_soon_threadsafe(self._schedule_flush)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Command '{command}' queued for sending")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to queue command: {e}")
+            return False
+    
+    def _schedule_flush(self):
+        """Arm the flush timer if one is not already pending (loop thread)."""
+        if self._flush_handle is None:
+            self._flush_handle = self._event_loop.call_later(
+                self.coalesce_delay,
+                lambda: self._event_loop.create_task(self._flush_send_buffer())
+            )
+    
+    async def _flush_send_buffer(self):
+        """Send all buffered commands as a single input message."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        with self._lock:
+            if not self._send_buffer:
+                return
+            pending, self._send_buffer = self._send_buffer, []
+        
+        # One '1' prefix per frame; the payload is the concatenated input
+        command_data = '1' + ''.join(pending)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Flushing {len(pending)} command(s) as: {repr(command_data)}")
+        await self.websocket.send(command_data)
+    
+    def flush(self) -> bool:
+        """
+        Immediately send any commands buffered by coalescing.
+        
+        Returns:
+            True if the buffer was flushed successfully
+        """
+        if not self.connected or not self.websocket or not self._event_loop:
+            return False
+        
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self._flush_send_buffer(),
+                self._event_loop
+            )
+            future.result(timeout=self.timeout)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to flush commands: {e}")
+            return False
+    
     def execute_command(self, command: str, wait_for_response: bool = True, timeout: float = 10.0) -> ServerResponse:
         """
         Execute a command and optionally wait for response.
         
+        The response holds every output chunk received from the first one
+        until output has been quiet for OUTPUT_QUIET_PERIOD seconds (or the
+        timeout expires), so it covers both the terminal's echo of the
+        command and the output that follows it.
+        
         Args:
             command: Command to execute
             wait_for_response: Whether to wait for command completion
@@ -320,10 +720,16 @@ class GottyWebSocketClient:
                 status_code=0
             )
         
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            # Apply idle-time output first so it is not taken as the reply
+            self._apply_deferred_output()
+            self._pending_waiters += 1
+            # Get current output count (len() stops growing once the
+            # ring buffer is full, so track the running total instead)
+            initial_output_count = self._output_count
+        
         try:
-            # Get current output length
-            initial_output_length = len(self.terminal_output)
-            
             # Send the command
             if not self.send_command(command):
                 return ServerResponse(
@@ -342,19 +748,24 @@ class GottyWebSocketClient:
                 )
             
             # Wait for response
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                with self._lock:
-                    if len(self.terminal_output) > initial_output_length:
-                        # Get new output
-                        new_output = self.terminal_output[initial_output_length:]
-                        return ServerResponse(
-                            success=True,
-                            data=new_output,
-                            message="Command executed successfully",
-                            status_code=200
-                        )
-                time.sleep(0.1)
+            with self._output_cond:
+                got_output = self._output_cond.wait_for(
+                    lambda: self._output_count > initial_output_count,
+                    timeout=timeout
+                )
+                if got_output:
+                    # The first chunk is often just the echo of the command
+                    self._wait_for_quiet_output(deadline)
+                    # Get new output
+                    new_count = self._output_count - initial_output_count
+                    start = max(0, len(self._terminal_output) - new_count)
+                    new_output = list(islice(self._terminal_output, start, None))
+                    return ServerResponse(
+                        success=True,
+                        data=new_output,
+                        message="Command executed successfully",
+                        status_code=200
+                    )
             
             # Timeout
             return ServerResponse(
@@ -372,31 +783,161 @@ class GottyWebSocketClient:
                 message=f"Command failed: {e}",
                 status_code=0
             )
+        finally:
+            with self._lock:
+                self._pending_waiters -= 1
     
-    def get_terminal_output(self, last_n_lines: Optional[int] = None) -> List[str]:
+    def _wait_for_quiet_output(self, deadline: float):
+        """Wait until output stops arriving or deadline passes (caller holds _lock)."""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            seen = self._output_count
+            self._output_cond.wait(min(self.OUTPUT_QUIET_PERIOD, remaining))
+            if self._output_count == seen:
+                return
+    
+    def execute_commands_batch(self, commands: List[str], timeout: float = 10.0) -> List[ServerResponse]:
         """
-        Get terminal output.
+        Execute several commands, sending them to the server as one frame.
+        
+        Waits until the terminal has echoed the last command and output has
+        then been quiet for OUTPUT_QUIET_PERIOD seconds, or until the timeout.
+        Output is split into lines and attributed to the commands by locating
+        each command's echo line in order, so the split is best-effort: a
+        terminal that echoes the whole batch before running it attributes all
+        output to the last command.
         
         Args:
-            last_n_lines: Number of lines to return (None for all)
+            commands: Commands to execute, in order
+            timeout: Timeout for the whole batch in seconds
             
         Returns:
-            List of terminal output lines
+            One ServerResponse per command
         """
+        if not commands:
+            return []
+        
+        if not self.connected or not self.websocket or not self._event_loop:
+            return [
+                ServerResponse(
+                    success=False,
+                    data=None,
+                    message="Not connected to WebSocket",
+                    status_code=0
+                )
+                for _ in commands
+            ]
+        
+        deadline = time.monotonic() + timeout
         with self._lock:
-            if last_n_lines is None:
-                return self.terminal_output.copy()
+            # Apply idle-time output first so it is not taken as the reply
+            self._apply_deferred_output()
+            self._pending_waiters += 1
+            initial_output_count = self._output_count
+            # Send anything still waiting to be coalesced ahead of the batch
+            pending, self._send_buffer = self._send_buffer, []
+        
+        try:
+            command_data = '1' + ''.join(pending) + ''.join(c + '\n' for c in commands)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Sending {len(commands)} command(s) as: {repr(command_data)}")
+            asyncio.run_coroutine_threadsafe(
+                self.websocket.send(command_data),
+                self._event_loop
+            )
+            
+            # Wait for the echo of every command, then for output to settle
+            with self._output_cond:
+                echoed = self._output_cond.wait_for(
+                    lambda: len(self._match_batch_echoes(
+                        commands, self._new_output_lines(initial_output_count)
+                    )) == len(commands),
+                    timeout=timeout
+                )
+                if echoed:
+                    self._wait_for_quiet_output(deadline)
+                lines = self._new_output_lines(initial_output_count)
+            
+            return self._split_batch_output(commands, lines, timed_out=not echoed)
+            
+        except Exception as e:
+            logger.error(f"Failed to execute commands: {e}")
+            return [
+                ServerResponse(
+                    success=False,
+                    data=None,
+                    message=f"Command failed: {e}",
+                    status_code=0
+                )
+                for _ in commands
+            ]
+        finally:
+            with self._lock:
+                self._pending_waiters -= 1
+    
+    def _new_output_lines(self, initial_output_count: int) -> List[str]:
+        """Output received past initial_output_count, as lines (caller holds _lock)."""
+        new_count = self._output_count - initial_output_count
+        start = max(0, len(self._terminal_output) - new_count)
+        return ''.join(islice(self._terminal_output, start, None)).splitlines(keepends=True)
+    
+    @staticmethod
+    def _match_batch_echoes(commands: List[str], lines: List[str]) -> List[int]:
+        """
+        Find the echo line of each command, in order.
+        
+        A line is an echo when it is the command itself, optionally preceded
+        by a prompt ending in a space. Returns the line index of each command
+        echoed so far, stopping at the first command not yet echoed.
+        """
+        echoes: List[int] = []
+        line_index = 0
+        for command in commands:
+            while line_index < len(lines):
+                line = lines[line_index].rstrip('\r\n')
+                line_index += 1
+                if line == command or (command and line.endswith(' ' + command)):
+                    echoes.append(line_index - 1)
+                    break
             else:
-                return self.terminal_output[-last_n_lines:].copy()
+                break
+        return echoes
     
-    def get_command_history(self) -> List[str]:
-        """Get command history."""
-        with self._lock:
-            return self.command_history.copy()
+    @classmethod
+    def _split_batch_output(cls, commands: List[str], lines: List[str], timed_out: bool = False) -> List[ServerResponse]:
+        """Attribute output lines to commands by their echo lines."""
+        echoes = cls._match_batch_echoes(commands, lines)
+        # Each command owns the lines from its echo up to the next echo;
+        # anything before the first echo belongs to the first command
+        starts = [0] + echoes[1:]
+        ends = echoes[1:] + [len(lines)]
+        groups = [lines[start:end] for start, end in zip(starts, ends)]
+        groups += [[] for _ in range(len(commands) - len(groups))]
+        
+        responses = []
+        for group in groups:
+            if group or not timed_out:
+                responses.append(ServerResponse(
+                    success=True,
+                    data=group,
+                    message="Command executed successfully",
+                    status_code=200
+                ))
+            else:
+                responses.append(ServerResponse(
+                    success=False,
+                    data=None,
+                    message="Command timed out",
+                    status_code=408
+                ))
+        return responses
     
     def add_output_callback(self, callback: Callable[[str], None]):
         """Add a callback for real-time output updates."""
-        self._output_callbacks.append(callback)
+        super().add_output_callback(callback)
+        self._output_callbacks_snapshot = tuple(self._output_callbacks)
     
     def add_command_callback(self, callback: Callable[[str], None]):
         """Add a callback for command completions."""
@@ -406,6 +947,7 @@ class GottyWebSocketClient:
         """Close the WebSocket connection."""
         self._running = False
         self.connected = False
+        self._connected_event.clear()
         
         if self._listener_thread and self._listener_thread.is_alive():
             self._listener_thread.join(timeout=5)
@@ -418,3 +960,257 @@ class GottyWebSocketClient:
                 )
             except:
                 pass
+        
+        if self._callback_executor:
+            self._callback_executor.shutdown(wait=False)
+            self._callback_executor = None
+
+class AsyncGottyWebSocketClient(_GottyClientBase):
+    """
+    Asyncio-native client for gotty terminal interfaces.
+    
+    Speaks the same protocol as GottyWebSocketClient, but connect(),
+    send_command() and execute_command() are coroutines that run in the
+    caller's event loop, so there is no background thread or cross-thread
+    hand-off per command. Callbacks are invoked on the event loop.
+    """
+    
+    # Seconds without new output after which a command's reply is complete
+    OUTPUT_QUIET_PERIOD = 0.05
+    
+    def __init__(
+        self,
+        webui_url: str,
+        username: str,
+        password: str,
+        timeout: int = 30,
+        compression: Optional[str] = None,
+        max_queue: Optional[int] = None,
+        terminal_output_maxlen: Optional[int] = 1000
+    ):
+        """
+        Initialize the async gotty WebSocket client.
+        
+        Args:
+            webui_url: URL of the web UI (e.g., 'http://localhost:8222')
+            username: Web UI username
+            password: Web UI password
+            timeout: Connection timeout in seconds
+            compression: WebSocket compression ('deflate' or None)
+            max_queue: Maximum number of unread incoming frames buffered by
+                websockets (None for unbounded)
+            terminal_output_maxlen: Number of output chunks kept in
+                terminal_output before the oldest are evicted (None for
+                unbounded)
+        """
+        super().__init__(
+            webui_url, username, password, timeout,
+            compression, max_queue, terminal_output_maxlen
+        )
+        self._listener_task: Optional[asyncio.Task] = None
+        
+        # Futures resolved on the next output chunk (or disconnect)
+        self._output_waiters: List[asyncio.Future] = []
+    
+    async def connect(self) -> bool:
+        """Connect to the gotty WebSocket interface."""
+        try:
+            # The HTTP probe is blocking, so keep it off the event loop
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, self._probe_web_ui):
+                return False
+            
+            self.websocket = await self._open_websocket(open_timeout=self.timeout)
+            await self.websocket.send(self._handshake_data)
+            
+            self.connected = True
+            self._listener_task = loop.create_task(self._listen_websocket())
+            logger.info("WebSocket connected successfully")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to connect: {e}")
+            # Don't leave a half-open socket behind if the handshake failed
+            await self._close_websocket()
+            return False
+    
+    async def _listen_websocket(self):
+        """Listen for WebSocket messages until the connection closes."""
+        try:
+            async for message in self.websocket:
+                self._handle_message(message)
+        except Exception as e:
+            logger.error(f"WebSocket error: {e}")
+        finally:
+            self.connected = False
+            self._wake_output_waiters()
+            logger.info("WebSocket connection closed")
+    
+    def _handle_message(self, message):
+        """Handle an incoming WebSocket message."""
+        try:
+            # Only output messages carry state; '1' and ord('1') cover text
+            # and binary frames
+            if not message or message[0] not in ('1', 49):
+                return
+            payload = message[1:]
+            if not payload:
+                return
+            
+            raw, text = decode_b64_utf8(payload)
+            self._terminal_output.append(text)
+            self._output_count += 1
+            _append_line_data(self._current_line_buf, raw, self._command_history)
+            self._wake_output_waiters()
+            
+            for callback in self._output_callbacks:
+                try:
+                    callback(text)
+                except Exception as e:
+                    logger.error(f"Callback error: {e}")
+                    
+        except Exception as e:
+            logger.error(f"Error handling message: {e}")
+    
+    def _wake_output_waiters(self):
+        """Resolve every pending output waiter."""
+        if not self._output_waiters:
+            return
+        waiters, self._output_waiters = self._output_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+    
+    async def _wait_for_output(self, initial_output_count: int):
+        """Wait until output arrives past initial_output_count or disconnect."""
+        loop = asyncio.get_running_loop()
+        while self._output_count <= initial_output_count and self.connected:
+            waiter = loop.create_future()
+            self._output_waiters.append(waiter)
+            await waiter
+    
+    async def _wait_for_quiet_output(self, deadline: float):
+        """Wait until output stops arriving, the deadline passes or disconnect."""
+        loop = asyncio.get_running_loop()
+        while self.connected:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(
+                    self._wait_for_output(self._output_count),
+                    timeout=min(self.OUTPUT_QUIET_PERIOD, remaining)
+                )
+            except asyncio.TimeoutError:
+                return
+    
+    async def send_command(self, command: str) -> bool:
+        """
+        Send a command using the gotty protocol.
+        
+        Args:
+            command: Command to send
+            
+        Returns:
+            True if sent successfully
+        """
+        if not self.connected or not self.websocket:
+            logger.error("Not connected to WebSocket")
+            return False
+        
+        try:
+            await self.websocket.send('1' + command + '\n')
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send command: {e}")
+            return False
+    
+    async def execute_command(self, command: str, wait_for_response: bool = True, timeout: float = 10.0) -> ServerResponse:
+        """
+        Execute a command and optionally wait for response.
+        
+        As with GottyWebSocketClient.execute_command, output is collected
+        until it has been quiet for OUTPUT_QUIET_PERIOD seconds.
+        
+        Args:
+            command: Command to execute
+            wait_for_response: Whether to wait for command completion
+            timeout: Timeout for response in seconds
+            
+        Returns:
+            ServerResponse with command result
+        """
+        if not self.connected:
+            return ServerResponse(
+                success=False,
+                data=None,
+                message="Not connected to WebSocket",
+                status_code=0
+            )
+        
+        deadline = asyncio.get_running_loop().time() + timeout
+        initial_output_count = self._output_count
+        
+        if not await self.send_command(command):
+            return ServerResponse(
+                success=False,
+                data=None,
+                message="Failed to send command",
+                status_code=0
+            )
+        
+        if not wait_for_response:
+            return ServerResponse(
+                success=True,
+                data=None,
+                message="Command sent (no response requested)",
+                status_code=200
+            )
+        
+        try:
+            await asyncio.wait_for(
+                self._wait_for_output(initial_output_count),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            pass
+        else:
+            # The first chunk is often just the echo of the command
+            await self._wait_for_quiet_output(deadline)
+        
+        new_count = self._output_count - initial_output_count
+        if new_count > 0:
+            start = max(0, len(self._terminal_output) - new_count)
+            return ServerResponse(
+                success=True,
+                data=list(islice(self._terminal_output, start, None)),
+                message="Command executed successfully",
+                status_code=200
+            )
+        
+        return ServerResponse(
+            success=False,
+            data=None,
+            message="Command timed out",
+            status_code=408
+        )
+    
+    async def _close_websocket(self):
+        """Close the WebSocket, ignoring errors from an already broken one."""
+        if self.websocket:
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+    
+    async def close(self):
+        """Close the WebSocket connection."""
+        self.connected = False
+        await self._close_websocket()
+        
+        if self._listener_task:
+            try:
+                await self._listener_task
+            except Exception:
+                pass
+            self._listener_task = None
@@ -1,4 +1,16 @@
-from setuptools import setup, find_packages
+import os
+
+from setuptools import Extension, setup
+
+# The Cython output-decoding fast path is opt-in: GOTTY_PY_BUILD_EXT=1
+ext_modules = []
+if os.environ.get("GOTTY_PY_BUILD_EXT"):
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        [Extension("gotty_py._fast_decode", ["_fast_decode.pyx"])],
+        language_level=3,
+    )
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -12,7 +24,10 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/twentworth/gotty-py",
-    packages=find_packages(),
+    # The repository root is the gotty_py package itself
+    package_dir={"gotty_py": "."},
+    packages=["gotty_py"],
+    ext_modules=ext_modules,
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -35,6 +50,9 @@ setup(
         "dev": [
             "pytest>=7.4.2",
             "pytest-cov>=4.1.0",
+            "pytest-timeout>=2.1.0",
+            "pytest-asyncio>=0.21.0",
+            "pytest-xdist>=3.3.0",
             "black>=23.7.0",
             "mypy>=1.5.1",
             "flake8>=6.0.0",
@@ -43,6 +61,12 @@ setup(
         "test": [
             "pytest>=7.4.2",
             "pytest-cov>=4.1.0",
+            "pytest-timeout>=2.1.0",
+            "pytest-asyncio>=0.21.0",
+            "pytest-xdist>=3.3.0",
+        ],
+        "fast": [
+            "uvloop>=0.19; sys_platform != 'win32'",
         ],
     },
 )
@@ -2,194 +2,801 @@
 Tests for the GottyWebSocketClient class.
 """
 
+import asyncio
+import base64
+import binascii
+import json
+import re
+import socket
 import threading
 import time
-from unittest.mock import AsyncMock, Mock, patch
+from collections import deque
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 
-from gotty_py import GottyWebSocketClient, ServerResponse
+from gotty_py import AsyncGottyWebSocketClient, GottyWebSocketClient, ServerResponse
+from gotty_py import gotty_client
+from gotty_py.gotty_client import decode_b64_utf8
+
+# Basic-auth token for the admin:admin credentials used throughout
+_EXPECTED_AUTH = base64.b64encode(b"admin:admin").decode("ascii")
+
+
+def _done_awaitable(loop, result=None):
+    """Already-resolved future, for Mock methods whose result is awaited."""
+    future = loop.create_future()
+    future.set_result(result)
+    return future
+
+
+def _async_recorder(reply=None):
+    """Async stand-in for a websocket method that records awaited calls."""
+    calls = []
+
+    async def method(*args):
+        calls.append(args)
+        if reply is not None:
+            await reply(*args)
+
+    method.calls = calls
+    return method
+
+
+def _probe_session(status_code):
+    """Stand-in for the HTTP probe session answering with status_code."""
+    return SimpleNamespace(
+        head=lambda *args, **kwargs: SimpleNamespace(status_code=status_code)
+    )
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Create one GottyWebSocketClient shared by the tests in this module."""
+    client = GottyWebSocketClient(
+        webui_url="http://192.168.0.113:8222",
+        username="admin",
+        password="admin",
+        timeout=30,
+    )
+    yield client
+    # The last test may leave a stub websocket behind; only the callback
+    # executor and listener need releasing here
+    client.websocket = None
+    client.close()
 
 
 class TestGottyWebSocketClient:
     """Test cases for GottyWebSocketClient."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.client = GottyWebSocketClient(
-            webui_url="http://192.168.0.113:8222",
+    @pytest.fixture(autouse=True)
+    def reset_client(self, client):
+        """Reset the shared client's mutable state before each test."""
+        client.terminal_output = deque(maxlen=1000)
+        client.command_history = deque(maxlen=100)
+        client._current_line_buf = bytearray()
+        client._output_count = 0
+        client._pending_output = []
+        client._deferred_output = []
+        client._pending_waiters = 0
+        client._output_callbacks = []
+        client._output_callbacks_snapshot = ()
+        client._command_callbacks = []
+        client.connected = False
+        client.websocket = None
+        client._event_loop = None
+        client._listener_thread = None
+        client._running = False
+        client._connected_event.clear()
+        client.coalesce_delay = 0.0
+        client._send_buffer = []
+        client._flush_handle = None
+
+    def test_initialization(self, client):
+        """Test client initialization."""
+        assert client.webui_url == "http://192.168.0.113:8222"
+        assert client.username == "admin"
+        assert client.password == "admin"
+        assert client.timeout == 30
+        assert not client.connected
+        assert client.websocket is None
+        assert list(client.terminal_output) == []
+        assert list(client.command_history) == []
+
+    def test_auth_header_generation(self, client):
+        """Test authentication header generation."""
+        assert client._auth_header == _EXPECTED_AUTH
+        assert client._get_auth_header() == _EXPECTED_AUTH
+        assert client._ws_headers["Authorization"] == f"Basic {_EXPECTED_AUTH}"
+
+    def test_auth_header_cached(self, client):
+        """Test that the auth header is computed once, not per call."""
+        assert client._get_auth_header() is client._get_auth_header()
+
+    def test_handshake_data(self, client):
+        """Test the precomputed gotty handshake message."""
+        handshake = json.loads(client._handshake_data)
+        assert handshake == {"Arguments": "", "AuthToken": "admin:admin"}
+
+    def test_url_parsing(self, client):
+        """Test URL parsing for WebSocket connection."""
+        assert client.base_url == "http://192.168.0.113:8222"
+        assert client.ws_url == "ws://192.168.0.113:8222/ws"
+        assert client.auth_token == "admin:admin"
+
+    @pytest.mark.parametrize(
+        "client_cls", [GottyWebSocketClient, AsyncGottyWebSocketClient]
+    )
+    def test_url_parsing_https(self, client_cls):
+        """Test that an https web UI is reached over a secure websocket."""
+        secure = client_cls(
+            webui_url="https://gotty.example.com/",
             username="admin",
             password="admin",
-            timeout=30,
         )
+        assert secure.base_url == "https://gotty.example.com"
+        assert secure.ws_url == "wss://gotty.example.com/ws"
 
-    def teardown_method(self):
-        """Clean up after each test."""
-        if hasattr(self, "client"):
-            self.client.close()
+    def test_http_session_created_lazily(self, monkeypatch):
+        """Test that the probe session is built on first use and then reused."""
+        monkeypatch.setattr(gotty_client, "_http_session", None)
 
-    def test_initialization(self):
-        """Test client initialization."""
-        assert self.client.webui_url == "http://192.168.0.113:8222"
-        assert self.client.username == "admin"
-        assert self.client.password == "admin"
-        assert self.client.timeout == 30
-        assert not self.client.connected
-        assert self.client.websocket is None
-        assert self.client.terminal_output == []
-        assert self.client.command_history == []
-
-    def test_auth_header_generation(self):
-        """Test authentication header generation."""
-        auth_header = self.client._get_auth_header()
-        expected = "YWRtaW46YWRtaW4="  # base64 of "admin:admin"
-        assert auth_header == expected
+        session = gotty_client._get_http_session()
+        assert gotty_client._get_http_session() is session
+        assert session.get_adapter("https://example.com") is not None
 
-    def test_url_parsing(self):
-        """Test URL parsing for WebSocket connection."""
-        assert self.client.base_url == "http://192.168.0.113:8222"
-        assert self.client.ws_url == "ws://192.168.0.113:8222/ws"
-        assert self.client.auth_token == "admin:admin"
-
-    @patch("requests.get")
-    def test_connect_http_failure(self, mock_get):
+    def test_connect_http_failure(self, client, monkeypatch):
         """Test connection failure when HTTP request fails."""
-        mock_get.return_value.status_code = 401
+        monkeypatch.setattr(gotty_client, "_http_session", _probe_session(401))
 
-        result = self.client.connect()
+        result = client.connect()
         assert not result
-        assert not self.client.connected
+        assert not client.connected
 
-    @patch("requests.get")
-    def test_connect_http_exception(self, mock_get):
+    def test_connect_http_exception(self, client, monkeypatch):
         """Test connection failure when HTTP request raises exception."""
-        mock_get.side_effect = Exception("Connection error")
+        mock_head = Mock(side_effect=Exception("Connection error"))
+        monkeypatch.setattr(
+            gotty_client, "_http_session", SimpleNamespace(head=mock_head)
+        )
 
-        result = self.client.connect()
+        result = client.connect()
         assert not result
-        assert not self.client.connected
+        assert not client.connected
 
-    @patch("requests.get")
-    @patch("websockets.connect")
-    def test_connect_success(self, mock_ws_connect, mock_get):
+    def test_connect_success(self, client, monkeypatch):
         """Test successful connection."""
-        # Mock HTTP response
-        mock_get.return_value.status_code = 200
+        # Stub HTTP response
+        monkeypatch.setattr(gotty_client, "_http_session", _probe_session(200))
 
-        # Mock WebSocket connection
-        mock_websocket = AsyncMock()
-        mock_ws_connect.return_value = mock_websocket
+        # Mock the async listener; it reports the connection as established
+        async def listen():
+            client.connected = True
+            client._connected_event.set()
 
-        # Mock the async listener
-        with patch.object(self.client, "_listen_websocket") as mock_listen:
-            mock_listen.return_value = None
+        mock_listen = Mock(side_effect=listen)
+        monkeypatch.setattr(client, "_listen_websocket", mock_listen)
+        # Run the listener inline instead of on a background thread, so
+        # connect() finds the connection ready and returns straight away
+        monkeypatch.setattr(client, "_start_listener", client._run_listener)
 
-            # Start connection in a thread to avoid blocking
-            def connect():
-                self.client.connect()
-
-            thread = threading.Thread(target=connect)
-            thread.start()
+        try:
+            assert client.connect()
+        finally:
+            client._event_loop.close()
+            asyncio.set_event_loop(None)
 
-            # Wait a bit for connection to establish
-            time.sleep(0.1)
+        mock_listen.assert_called_once_with()
+        assert client.connected
+        assert client._connected_event.is_set()
 
-            # Stop the client
-            self.client.close()
-            thread.join(timeout=1)
+    def test_connect_async(self, client, monkeypatch):
+        """Test that _connect_async opens the websocket and sends the handshake."""
+        loop = asyncio.new_event_loop()
+        client._event_loop = loop
+        mock_websocket = SimpleNamespace(send=Mock(return_value=_done_awaitable(loop)))
+        mock_ws_connect = Mock(return_value=_done_awaitable(loop, mock_websocket))
+        monkeypatch.setattr("websockets.connect", mock_ws_connect)
 
-    def test_send_command_not_connected(self):
+        try:
+            loop.run_until_complete(client._connect_async())
+        finally:
+            loop.close()
+
+        assert mock_ws_connect.call_args.args == (client.ws_url,)
+        assert mock_ws_connect.call_args.kwargs["additional_headers"] == {
+            "Authorization": f"Basic {_EXPECTED_AUTH}",
+            "User-Agent": "GottyPythonClient/1.0",
+        }
+        mock_websocket.send.assert_called_once_with(client._handshake_data)
+        assert client.websocket is mock_websocket
+        assert client.connected
+        assert client._connected_event.is_set()
+
+    def test_connect_websocket_failure_returns_promptly(self, client, monkeypatch):
+        """Test that connect() stops waiting as soon as the listener fails."""
+        monkeypatch.setattr(gotty_client, "_http_session", _probe_session(200))
+        mock_ws_connect = Mock(side_effect=OSError("Connection refused"))
+        monkeypatch.setattr("websockets.connect", mock_ws_connect)
+
+        start = time.monotonic()
+        assert not client.connect()
+        assert time.monotonic() - start < 5
+
+    def test_send_command_not_connected(self, client):
         """Test sending command when not connected."""
-        result = self.client.send_command("ls")
+        result = client.send_command("ls")
         assert not result
 
-    @patch("asyncio.run_coroutine_threadsafe")
-    def test_send_command_success(self, mock_run_coroutine):
+    @pytest.mark.asyncio
+    async def test_send_command_success(self, client):
         """Test successful command sending."""
-        # Mock connection state
-        self.client.connected = True
-        self.client.websocket = AsyncMock()
-        self.client._event_loop = Mock()
+        client.connected = True
+        client.websocket = SimpleNamespace(send=_async_recorder())
+        client._event_loop = asyncio.get_running_loop()
 
-        result = self.client.send_command("ls")
+        result = client.send_command("ls")
         assert result
-        mock_run_coroutine.assert_called_once()
+        # The send is scheduled on the loop; let it run before checking
+        await asyncio.sleep(0.01)
+        assert client.websocket.send.calls == [("1ls\n",)]
+
+    @pytest.mark.asyncio
+    async def test_send_command_coalesced(self, client):
+        """Test that bursts of commands are coalesced into one frame."""
+        client.coalesce_delay = 0.005
+        client.connected = True
+        client._event_loop = asyncio.get_running_loop()
+        client.websocket = SimpleNamespace(
+            send=Mock(return_value=_done_awaitable(client._event_loop))
+        )
 
-    def test_execute_command_not_connected(self):
-        """Test executing command when not connected."""
-        response = self.client.execute_command("ls")
-        assert not response.success
-        assert response.message == "Not connected to WebSocket"
-        assert response.status_code == 0
-
-    def test_execute_command_send_failure(self):
-        """Test command execution when send fails."""
-        # Mock connection state
-        self.client.connected = True
-
-        with patch.object(self.client, "send_command", return_value=False):
-            response = self.client.execute_command("ls")
-            assert not response.success
-            assert response.message == "Failed to send command"
-
-    def test_execute_command_no_wait(self):
-        """Test command execution without waiting for response."""
-        # Mock connection state
-        self.client.connected = True
-
-        with patch.object(self.client, "send_command", return_value=True):
-            response = self.client.execute_command("ls", wait_for_response=False)
-            assert response.success
-            assert response.message == ("Command sent (no response requested)")
-            assert response.status_code == 200
-
-    def test_get_terminal_output(self):
+        for command in ("ls", "pwd", "whoami"):
+            assert client.send_command(command)
+        await asyncio.sleep(0.05)
+
+        client.websocket.send.assert_called_once_with("1ls\npwd\nwhoami\n")
+
+    @pytest.mark.parametrize(
+        "connected,send_ret,wait,ok,msg,code",
+        [
+            (False, None, True, False, "Not connected to WebSocket", 0),
+            (True, False, True, False, "Failed to send command", 0),
+            (True, True, False, True, "Command sent (no response requested)", 200),
+        ],
+    )
+    def test_execute_command_matrix(
+        self, client, monkeypatch, connected, send_ret, wait, ok, msg, code
+    ):
+        """Test execute_command results for each connection/send outcome."""
+        client.connected = connected
+        if send_ret is not None:
+            monkeypatch.setattr(client, "send_command", lambda *a, **k: send_ret)
+
+        response = client.execute_command("ls", wait_for_response=wait)
+        assert response.success is ok
+        assert response.message == msg
+        assert response.status_code == code
+
+    def test_execute_command_wakes_on_output(self, client, monkeypatch):
+        """Test that execute_command returns as soon as output arrives."""
+        client.connected = True
+        payload = "1" + base64.b64encode(b"file.txt\n").decode()
+
+        def deliver():
+            asyncio.run(client._handle_message(payload))
+
+        # Reply shortly after the command is sent
+        timer = threading.Timer(0.01, deliver)
+        monkeypatch.setattr(
+            client, "send_command", lambda command: timer.start() or True
+        )
+        start = time.monotonic()
+        response = client.execute_command("ls", timeout=5.0)
+        timer.join()
+
+        assert response.success
+        assert response.data == ["file.txt\n"]
+        assert time.monotonic() - start < 1.0
+
+    def test_execute_command_collects_output_after_echo(self, client, monkeypatch):
+        """Test that output following the command's echo is part of the reply."""
+        client.connected = True
+
+        def deliver():
+            for chunk in (b"x\r\n", b"out:x\r\n"):
+                payload = "1" + base64.b64encode(chunk).decode()
+                asyncio.run(client._handle_message(payload))
+                time.sleep(0.01)
+
+        # Start replying only once the command is sent, as a server would
+        thread = threading.Thread(target=deliver)
+        monkeypatch.setattr(
+            client, "send_command", lambda command: thread.start() or True
+        )
+        response = client.execute_command("x", timeout=5.0)
+        thread.join()
+
+        assert response.success
+        assert response.data == ["x\r\n", "out:x\r\n"]
+
+    def test_execute_commands_batch(self, client, monkeypatch):
+        """Test that a batch is sent as one frame and split per command."""
+        client.connected = True
+        client.websocket = SimpleNamespace(send=_async_recorder())
+        client._event_loop = SimpleNamespace()
+        chunks = [b"ls\r\n", b"file.txt\r\n", b"pwd\r\n", b"/home\r\n"]
+
+        async def deliver(send):
+            await send
+            for chunk in chunks:
+                payload = "1" + base64.b64encode(chunk).decode()
+                await client._handle_message(payload)
+
+        def run_coroutine(coro, loop):
+            threading.Thread(target=asyncio.run, args=(deliver(coro),)).start()
+
+        monkeypatch.setattr("asyncio.run_coroutine_threadsafe", run_coroutine)
+        responses = client.execute_commands_batch(["ls", "pwd"], timeout=5.0)
+
+        assert client.websocket.send.calls == [("1ls\npwd\n",)]
+        assert [r.success for r in responses] == [True, True]
+        assert responses[0].data == ["ls\r\n", "file.txt\r\n"]
+        assert responses[1].data == ["pwd\r\n", "/home\r\n"]
+
+    def test_execute_commands_batch_echoes_in_one_frame(self, client, monkeypatch):
+        """Test a terminal that echoes the whole batch before any output."""
+        client.connected = True
+        client.websocket = SimpleNamespace(send=_async_recorder())
+        client._event_loop = SimpleNamespace()
+        chunks = [
+            b"ls\r\npwd\r\nwhoami\r\n",
+            b"file.txt\r\n",
+            b"/home\r\n",
+            b"admin\r\n",
+        ]
+
+        def deliver(send):
+            asyncio.run(send)
+            for chunk in chunks:
+                payload = "1" + base64.b64encode(chunk).decode()
+                asyncio.run(client._handle_message(payload))
+                time.sleep(0.01)
+
+        def run_coroutine(coro, loop):
+            threading.Thread(target=deliver, args=(coro,)).start()
+
+        monkeypatch.setattr("asyncio.run_coroutine_threadsafe", run_coroutine)
+        responses = client.execute_commands_batch(["ls", "pwd", "whoami"], timeout=5.0)
+
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert [r.data for r in responses] == [
+            ["ls\r\n"],
+            ["pwd\r\n"],
+            ["whoami\r\n", "file.txt\r\n", "/home\r\n", "admin\r\n"],
+        ]
+
+    def test_split_batch_output(self):
+        """Test splitting batch output on echo lines only."""
+        lines = [
+            "$ cat notes\r\n",
+            "run ls later\r\n",
+            "tools\r\n",
+            "$ ls\r\n",
+            "a.txt\r\n",
+        ]
+        responses = GottyWebSocketClient._split_batch_output(["cat notes", "ls"], lines)
+        assert [r.data for r in responses] == [lines[:3], lines[3:]]
+
+        # A command that was never echoed only times out if the wait did
+        responses = GottyWebSocketClient._split_batch_output(
+            ["ls", "pwd"], ["ls\r\n"], timed_out=True
+        )
+        assert [r.status_code for r in responses] == [200, 408]
+        responses = GottyWebSocketClient._split_batch_output(["ls", "pwd"], ["ls\r\n"])
+        assert [r.status_code for r in responses] == [200, 200]
+        assert responses[1].data == []
+
+    def test_get_terminal_output(self, client):
         """Test getting terminal output."""
         # Add some test data
-        self.client.terminal_output = ["line1", "line2", "line3"]
+        client.terminal_output = ["line1", "line2", "line3"]
 
         # Get all output
-        output = self.client.get_terminal_output()
+        output = client.get_terminal_output()
         assert output == ["line1", "line2", "line3"]
 
         # Get last 2 lines
-        output = self.client.get_terminal_output(last_n_lines=2)
+        output = client.get_terminal_output(last_n_lines=2)
         assert output == ["line2", "line3"]
 
-    def test_get_command_history(self):
+    @pytest.mark.asyncio
+    async def test_terminal_output_is_bounded(self, client):
+        """Test that terminal output evicts the oldest entries when full."""
+        for i in range(1005):
+            payload = base64.b64encode(f"line{i}\n".encode()).decode()
+            await client._handle_message("1" + payload)
+
+        output = client.get_terminal_output()
+        assert len(output) == 1000
+        assert output[0] == "line5\n"
+        assert output[-1] == "line1004\n"
+        assert len(client.get_command_history()) == 100
+
+    def test_terminal_output_maxlen(self):
+        """Test that the terminal output bound can be configured."""
+        client = GottyWebSocketClient(
+            webui_url="http://192.168.0.113:8222",
+            username="admin",
+            password="admin",
+            terminal_output_maxlen=3,
+        )
+        client.terminal_output.extend(["a", "b", "c", "d"])
+
+        assert client.get_terminal_output() == ["b", "c", "d"]
+        assert client.get_terminal_output(last_n_lines=2) == ["c", "d"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "client_cls", [GottyWebSocketClient, AsyncGottyWebSocketClient]
+    )
+    async def test_terminal_output_unbounded(self, client_cls, caplog):
+        """Test that terminal_output_maxlen=None keeps all output."""
+        unbounded = client_cls(
+            webui_url="http://192.168.0.113:8222",
+            username="admin",
+            password="admin",
+            terminal_output_maxlen=None,
+        )
+        payload = "1" + base64.b64encode(b"line\n").decode()
+        for _ in range(1005):
+            result = unbounded._handle_message(payload)
+            if asyncio.iscoroutine(result):
+                await result
+
+        assert len(unbounded.get_terminal_output()) == 1005
+        assert "Error handling message" not in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_handle_binary_output_message(self, client):
+        """Test that binary frames are decoded like text frames."""
+        payload = b"1" + base64.b64encode(b"hello\n")
+        await client._handle_message(payload)
+        await client._handle_message(b"1")
+
+        assert client.get_terminal_output() == ["hello\n"]
+        assert client.get_command_history() == ["hello"]
+
+    @pytest.mark.asyncio
+    async def test_idle_output_decoded_on_read(self, client):
+        """Test that output is only decoded once read when nobody is waiting."""
+        payload = "1" + base64.b64encode(b"idle\n").decode()
+        await client._handle_message(payload)
+
+        assert len(client._deferred_output) == 1
+        assert len(client._terminal_output) == 0
+
+        assert client.get_terminal_output() == ["idle\n"]
+        assert client.get_command_history() == ["idle"]
+        assert client._deferred_output == []
+
+    @pytest.mark.asyncio
+    async def test_idle_output_visible_in_public_attributes(self, client):
+        """Test that terminal_output and command_history include deferred output."""
+        payload = "1" + base64.b64encode(b"idle\n").decode()
+        await client._handle_message(payload)
+
+        assert list(client.terminal_output) == ["idle\n"]
+        assert list(client.command_history) == ["idle"]
+
+    def test_decode_b64_utf8(self):
+        """Test the output decoder on text and binary payloads."""
+        encoded = base64.b64encode("h\u00e9\r\n".encode())
+        expected = ("h\u00e9\r\n".encode(), "h\u00e9\r\n")
+
+        assert decode_b64_utf8(encoded) == expected
+        assert decode_b64_utf8(encoded.decode()) == expected
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            b"",
+            b"YWJj",
+            b"YWI=",
+            b"YQ==",
+            b"YQ\n=\n=",
+            b"!!YWJj\r\n",
+            base64.b64encode(bytes(range(256)) * 40),
+            base64.b64encode("h\u00e9\u4e2d\r\n".encode()).decode(),
+        ],
+    )
+    def test_fast_decode_matches_binascii(self, payload):
+        """Test that the Cython decoder agrees with the binascii fallback."""
+        _fast_decode = pytest.importorskip("gotty_py._fast_decode")
+        raw = binascii.a2b_base64(payload)
+
+        assert _fast_decode.decode_b64_utf8(payload) == (
+            raw,
+            raw.decode("utf-8", "ignore"),
+        )
+
+    @pytest.mark.parametrize(
+        "payload",
+        [b"Y", b"YQ", b"YWJjY", b"YQ=", b"Y===", b"=YQ==", b"YQ=x=", "YQ\u00e9=="],
+    )
+    def test_fast_decode_matches_binascii_on_malformed_input(self, payload):
+        """Test that the Cython decoder rejects or recovers like binascii."""
+        _fast_decode = pytest.importorskip("gotty_py._fast_decode")
+        try:
+            raw = binascii.a2b_base64(payload)
+        except ValueError as exc:
+            with pytest.raises(type(exc), match=re.escape(str(exc))):
+                _fast_decode.decode_b64_utf8(payload)
+        else:
+            assert _fast_decode.decode_b64_utf8(payload) == (
+                raw,
+                raw.decode("utf-8", "ignore"),
+            )
+
+    @pytest.mark.asyncio
+    async def test_command_history_line_splitting(self, client):
+        """Test that history collects complete lines across frame boundaries."""
+        chunks = [
+            b"ab",
+            b"c\nde",
+            "f\u00e9".encode()[:-1],
+            "\u00e9".encode()[-1:] + b"\n",
+        ]
+
+        for chunk in chunks:
+            await client._handle_message("1" + base64.b64encode(chunk).decode())
+
+        assert client.get_command_history() == ["abc", "def\u00e9"]
+        assert client.current_line == ""
+
+        await client._handle_message("1" + base64.b64encode(b"tail").decode())
+        assert client.current_line == "tail"
+
+    def test_get_command_history(self, client):
         """Test getting command history."""
         # Add some test data
-        self.client.command_history = ["ls", "pwd", "whoami"]
+        client.command_history = ["ls", "pwd", "whoami"]
 
-        history = self.client.get_command_history()
+        history = client.get_command_history()
         assert history == ["ls", "pwd", "whoami"]
 
-    def test_add_callbacks(self):
+    def test_add_callbacks(self, client):
         """Test adding callbacks."""
 
         def test_callback(data):
             pass
 
-        self.client.add_output_callback(test_callback)
-        self.client.add_command_callback(test_callback)
+        client.add_output_callback(test_callback)
+        client.add_command_callback(test_callback)
+
+        assert len(client._output_callbacks) == 1
+        assert len(client._command_callbacks) == 1
+
+    @pytest.mark.asyncio
+    async def test_output_callbacks_batched_off_loop(self, client):
+        """Test that a burst of output reaches callbacks as one batch."""
+        received = []
+        done = threading.Event()
+
+        def on_output(data):
+            received.append((data, threading.current_thread().name))
+            done.set()
+
+        client.add_output_callback(on_output)
 
-        assert len(self.client._output_callbacks) == 1
-        assert len(self.client._command_callbacks) == 1
+        for chunk in (b"one\n", b"two\n"):
+            payload = "1" + base64.b64encode(chunk).decode()
+            await client._handle_message(payload)
+        await asyncio.sleep(0)
 
-    def test_close(self):
+        assert done.wait(1.0)
+        assert [data for data, _ in received] == ["one\ntwo\n"]
+        assert received[0][1].startswith("gotty-callbacks")
+        assert client.get_terminal_output() == ["one\n", "two\n"]
+        assert client.get_command_history() == ["one", "two"]
+
+    def test_close(self, client):
         """Test closing the connection."""
-        # Mock thread
-        self.client._listener_thread = Mock()
-        self.client._listener_thread.is_alive.return_value = False
+        client._listener_thread = SimpleNamespace(
+            is_alive=lambda: False, join=lambda timeout=None: None
+        )
+        websocket = SimpleNamespace(close=_async_recorder())
+        client.websocket = websocket
+        # A stub loop would leave the close() coroutine un-awaited, so hand
+        # the client a real (idle) loop and let it run the scheduled close
+        loop = asyncio.new_event_loop()
+        client._event_loop = loop
 
-        # Mock WebSocket
-        self.client.websocket = AsyncMock()
-        self.client._event_loop = Mock()
+        try:
+            client.close()
+            loop.run_until_complete(asyncio.sleep(0))
+        finally:
+            loop.close()
+
+        assert not client._running
+        assert not client.connected
+        assert websocket.close.calls == [()]
+
+
+class _FakeWebSocket:
+    """Minimal websocket that replays frames, then waits until closed."""
+
+    def __init__(self, frames=(), send_error=None):
+        self.frames = list(frames)
+        self.send_error = send_error
+        self.sent = []
+        self.closed = asyncio.Event()
+
+    async def send(self, data):
+        if self.send_error:
+            raise self.send_error
+        self.sent.append(data)
+
+    async def close(self):
+        self.closed.set()
+
+    def __aiter__(self):
+        return self._replay()
+
+    async def _replay(self):
+        for frame in self.frames:
+            yield frame
+        await self.closed.wait()
+
+
+@pytest.fixture
+def async_client():
+    """Create a fresh AsyncGottyWebSocketClient for each test."""
+    return AsyncGottyWebSocketClient(
+        webui_url="http://192.168.0.113:8222",
+        username="admin",
+        password="admin",
+    )
+
+
+class TestAsyncGottyWebSocketClient:
+    """Test cases for AsyncGottyWebSocketClient."""
+
+    @pytest.mark.asyncio
+    async def test_connect_success(self, async_client, monkeypatch):
+        """Test connecting, receiving output and closing."""
+        monkeypatch.setattr(gotty_client, "_http_session", _probe_session(200))
+        websocket = _FakeWebSocket(["1" + base64.b64encode(b"hi\n").decode()])
+        done = _done_awaitable(asyncio.get_running_loop(), websocket)
+        mock_ws_connect = Mock(return_value=done)
+        monkeypatch.setattr("websockets.connect", mock_ws_connect)
+
+        assert await async_client.connect()
+        assert async_client.connected
+        assert websocket.sent == [async_client._handshake_data]
+        assert mock_ws_connect.call_args.kwargs["open_timeout"] == async_client.timeout
+
+        await asyncio.sleep(0)
+        assert async_client.get_terminal_output() == ["hi\n"]
+
+        await async_client.close()
+        assert websocket.closed.is_set()
+        assert async_client._listener_task is None
+
+    @pytest.mark.asyncio
+    async def test_connect_http_failure(self, async_client, monkeypatch):
+        """Test that a rejected HTTP probe stops before opening the websocket."""
+        monkeypatch.setattr(gotty_client, "_http_session", _probe_session(401))
+        mock_ws_connect = Mock()
+        monkeypatch.setattr("websockets.connect", mock_ws_connect)
+
+        assert not await async_client.connect()
+        mock_ws_connect.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connect_handshake_failure_closes_websocket(
+        self, async_client, monkeypatch
+    ):
+        """Test that a websocket whose handshake fails is closed again."""
+        monkeypatch.setattr(gotty_client, "_http_session", _probe_session(200))
+        websocket = _FakeWebSocket(send_error=OSError("Connection reset"))
+        done = _done_awaitable(asyncio.get_running_loop(), websocket)
+        monkeypatch.setattr("websockets.connect", Mock(return_value=done))
+
+        assert not await async_client.connect()
+        assert not async_client.connected
+        assert websocket.closed.is_set()
+
+    @pytest.mark.asyncio
+    async def test_listen_websocket_wakes_waiters_on_disconnect(self, async_client):
+        """Test that the listener handles frames and wakes waiters when it ends."""
+        websocket = _FakeWebSocket(["1" + base64.b64encode(b"bye\n").decode()])
+        websocket.closed.set()
+        async_client.websocket = websocket
+        async_client.connected = True
+        waiter = asyncio.get_running_loop().create_future()
+        async_client._output_waiters.append(waiter)
+
+        await async_client._listen_websocket()
+
+        assert not async_client.connected
+        assert waiter.done()
+        assert async_client.get_command_history() == ["bye"]
+
+    @pytest.mark.asyncio
+    async def test_close(self, async_client):
+        """Test that close() closes the websocket and awaits the listener."""
+        websocket = _FakeWebSocket()
+        async_client.websocket = websocket
+        async_client.connected = True
+        listener = asyncio.create_task(async_client._listen_websocket())
+        async_client._listener_task = listener
+        await asyncio.sleep(0)
+
+        await async_client.close()
+
+        assert not async_client.connected
+        assert websocket.closed.is_set()
+        assert listener.done()
+        assert async_client._listener_task is None
+
+    @pytest.mark.asyncio
+    async def test_execute_command_not_connected(self, async_client):
+        """Test executing command when not connected."""
+        response = await async_client.execute_command("ls")
+        assert not response.success
+        assert response.message == "Not connected to WebSocket"
+
+    @pytest.mark.asyncio
+    async def test_execute_command_success(self, async_client):
+        """Test that output sent in reply to a command is returned."""
+        async_client.connected = True
+        received = []
+        async_client.add_output_callback(received.append)
+
+        async def reply(data):
+            payload = "1" + base64.b64encode(b"file.txt\n").decode()
+            asyncio.get_running_loop().call_soon(async_client._handle_message, payload)
+
+        async_client.websocket = SimpleNamespace(send=_async_recorder(reply))
+
+        response = await async_client.execute_command("ls", timeout=5.0)
 
-        self.client.close()
+        assert async_client.websocket.send.calls == [("1ls\n",)]
+        assert response.success
+        assert response.data == ["file.txt\n"]
+        assert received == ["file.txt\n"]
+        assert async_client.get_command_history() == ["file.txt"]
 
-        assert not self.client._running
-        assert not self.client.connected
+    @pytest.mark.asyncio
+    async def test_execute_command_collects_output_after_echo(self, async_client):
+        """Test that output following the command's echo is part of the reply."""
+        async_client.connected = True
+
+        async def reply(data):
+            loop = asyncio.get_running_loop()
+            for delay, chunk in ((0, b"x\r\n"), (0.01, b"out:x\r\n")):
+                payload = "1" + base64.b64encode(chunk).decode()
+                loop.call_later(delay, async_client._handle_message, payload)
+
+        async_client.websocket = SimpleNamespace(send=_async_recorder(reply))
+
+        response = await async_client.execute_command("x", timeout=5.0)
+
+        assert response.success
+        assert response.data == ["x\r\n", "out:x\r\n"]
+
+    @pytest.mark.asyncio
+    async def test_execute_command_timeout(self, async_client):
+        """Test that a command without output times out."""
+        async_client.connected = True
+        done = _done_awaitable(asyncio.get_running_loop())
+        async_client.websocket = SimpleNamespace(send=Mock(return_value=done))
+
+        response = await async_client.execute_command("ls", timeout=0.01)
+        assert not response.success
+        assert response.status_code == 408
 
 
 class TestServerResponse:
@@ -208,44 +815,55 @@ class TestServerResponse:
 
 
 # Integration tests (these require a real server)
+GOTTY_SERVER = ("192.168.0.113", 8222)
+
+
+@pytest.fixture(scope="session")
+def gotty_server():
+    """Skip integration tests quickly when the gotty server is unreachable."""
+    try:
+        socket.create_connection(GOTTY_SERVER, timeout=0.2).close()
+    except OSError:
+        pytest.skip("gotty server unreachable")
+    return GOTTY_SERVER
+
+
+@pytest.fixture(scope="session")
+def connected_client(gotty_server):
+    """Connect once and share the websocket across the integration tests."""
+    client = GottyWebSocketClient(
+        webui_url="http://192.168.0.113:8222",
+        username="admin",
+        password="admin",
+    )
+    # The port may be open without a working gotty instance behind it
+    if not client.connect():
+        client.close()
+        pytest.skip("could not connect to gotty server")
+    yield client
+    client.close()
+
+
 class TestGottyClientIntegration:
     """Integration tests that require a real gotty server."""
 
     @pytest.mark.integration
-    def test_real_connection(self):
+    @pytest.mark.xdist_group("integration_serial")
+    @pytest.mark.timeout(10)
+    def test_real_connection(self, connected_client):
         """Test connection to real gotty server."""
-        client = GottyWebSocketClient(
-            webui_url="http://192.168.0.113:8222",
-            username="admin",
-            password="admin",
-        )
-
-        try:
-            # This test requires the server to be running
-            # We'll just test the connection attempt
-            client.connect()
-            # Note: This might fail if server is not available
-            # That's expected in CI environments
-        finally:
-            client.close()
+        # The connection attempt itself happens once in the
+        # connected_client fixture
+        assert connected_client.connected
 
     @pytest.mark.integration
-    def test_real_command_execution(self):
+    @pytest.mark.xdist_group("integration_serial")
+    @pytest.mark.timeout(10)
+    def test_real_command_execution(self, connected_client):
         """Test command execution on real server."""
-        client = GottyWebSocketClient(
-            webui_url="http://192.168.0.113:8222",
-            username="admin",
-            password="admin",
-        )
-
-        try:
-            if client.connect():
-                # Test the "ls" command
-                response = client.execute_command("ls", timeout=5.0)
-                # We expect some response, even if it's an error
-                assert response is not None
-        finally:
-            client.close()
+        # Test the "ls" command
+        response = connected_client.execute_command("ls", timeout=5.0)
+        assert response.success, response.message
 
 
 if __name__ == "__main__":